@@ -1,7 +1,14 @@
 import os
+import asyncio
+import functools
 import logging
 import json
-from typing import Optional, Any, Dict, List
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Iterator
 from tools.ProcessRequest import ProcessReq
 from tools.ListDatabases import ListDatabases
 from tools.ListSchemas import ListSchemas
@@ -17,11 +24,36 @@ from tools.CheckDataQuality import CheckDataQuality
 from tools.AnalyzePerformance import AnalyzePerformance
 from tools.CreateStoredProcedure import CreateStoredProcedure
 import snowflake.connector
+from snowflake.connector.errors import InterfaceError, OperationalError
+from pool import ConnectionPool
 from dotenv import load_dotenv
 
 # Configure logging
 logger = logging.getLogger('snowflake_connection')
 
+# Reconnect attempts and base backoff (seconds) for transient network errors
+CONNECT_ATTEMPTS = 3
+CONNECT_BACKOFF = 0.2
+
+# Default number of concurrent Snowflake sessions shared by all tool calls;
+# override with SNOWFLAKE_POOL_SIZE
+DEFAULT_POOL_SIZE = 8
+
+# Connections opened in the background at startup; the rest open on demand.
+# Override with SNOWFLAKE_POOL_MIN
+DEFAULT_POOL_MIN = 2
+
+# Seconds a pooled connection is reused before it is replaced;
+# override with SNOWFLAKE_POOL_LIFETIME
+DEFAULT_POOL_LIFETIME = 3600
+
+# Threads per connection downloading result chunks ahead of the reader;
+# override with SNOWFLAKE_PREFETCH_THREADS
+DEFAULT_PREFETCH_THREADS = 8
+
+# Authenticators that prompt the user (a browser window) on every login
+INTERACTIVE_AUTHENTICATORS = frozenset({"externalbrowser"})
+
 # Load environment variables
 load_dotenv()
 #hre
@@ -37,56 +69,151 @@ class SnowflakeConnection(ProcessReq,ListDatabases,ListSchemas,ListTables,Descri
             "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
              **({"password": os.getenv("SNOWFLAKE_PASSWORD")} if os.getenv("SNOWFLAKE_PASSWORD") else {"authenticator": os.getenv("SNOWFLAKE_AUTHENTICATOR")})
         }
-        self.conn: Optional[snowflake.connector.SnowflakeConnection] = None
+        pool_size = int(os.getenv("SNOWFLAKE_POOL_SIZE", DEFAULT_POOL_SIZE))
+        # Every extra session would prompt the user again, so interactive logins keep
+        # to the single user session for all tool calls and never log in ahead of demand
+        self._single_session = (self.config.get("authenticator") or "").lower() in INTERACTIVE_AUTHENTICATORS
+        if self._single_session:
+            pool_size = 1
+        self.prefetch_threads = int(os.getenv("SNOWFLAKE_PREFETCH_THREADS", DEFAULT_PREFETCH_THREADS))
+        pool_lifetime = float(os.getenv("SNOWFLAKE_POOL_LIFETIME", DEFAULT_POOL_LIFETIME))
+        self._pool = ConnectionPool(self._connect, pool_size, pool_lifetime)
+        # One worker per pooled connection, so a worker never waits on a pool slot
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="snowflake")
+        # Tool calls run in worker threads; each thread sees the connection it checked out
+        self._local = threading.local()
+        # process_req runs on its own long-lived session, so USE, SET, ALTER SESSION,
+        # temporary tables and open transactions carry over between its calls
+        # without leaking into the pooled sessions the other tools share
+        self._session: Optional[snowflake.connector.SnowflakeConnection] = None
+        self._session_lock = threading.Lock()
+        # Authenticate a few connections in the background so the first tool calls skip the login
+        pool_min = 0 if self._single_session else int(os.getenv("SNOWFLAKE_POOL_MIN", DEFAULT_POOL_MIN))
+        for _ in range(min(pool_min, pool_size)):
+            self._executor.submit(self._pool.warm)
         
         # Log configuration (excluding password)
         safe_config = {k: v for k, v in self.config.items() if k != 'password'}
-        logger.info(f"Initialized with config: {json.dumps(safe_config)}")
+        logger.info("Initialized with config: %s", json.dumps(safe_config))
     
-    def verify_link(self) -> snowflake.connector.SnowflakeConnection:
+    @contextmanager
+    def checkout(self) -> Iterator[snowflake.connector.SnowflakeConnection]:
         """
-        Ensure the database connection is available and valid.
-        
-        Returns:
-            A valid Snowflake connection
-            
-        Raises:
-            Exception: If connection cannot be established
+        Borrow a pooled connection for the duration of the block.
+
+        Nested checkouts on the same thread share the outer connection, so a
+        tool method can call another without holding two pool slots. With an
+        interactive authenticator the user session is borrowed instead.
         """
-        try:
-            # Create new connection if needed
-            if self.conn is None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        with (self._user_session() if self._single_session else self._pool.checkout()) as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+
+    def in_session(self, method: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a tool method on the dedicated user session instead of a pooled one.
+
+        Calls are serialized on that session, as they were on the single
+        connection before pooling. A session that fails with a network-level
+        error is closed and reopened on the next call.
+        """
+        with self._user_session() as conn:
+            self._local.conn = conn
+            try:
+                return method(*args)
+            finally:
+                self._local.conn = None
+
+    @contextmanager
+    def _user_session(self) -> Iterator[snowflake.connector.SnowflakeConnection]:
+        """Hold the dedicated user session for the block, opening it if needed."""
+        with self._session_lock:
+            if self._session is None or self._session.is_closed():
+                self._session = self._connect()
+            try:
+                yield self._session
+            except (OperationalError, InterfaceError):
+                self._close_session()
+                raise
+
+    def _connect(self) -> snowflake.connector.SnowflakeConnection:
+        """
+        Open a new Snowflake connection, retrying transient failures with backoff.
+
+        Only network-level errors are retried; authentication and SQL errors
+        are raised immediately.
+        """
+        for attempt in range(CONNECT_ATTEMPTS):
+            try:
                 logger.info("Creating new Snowflake connection...")
-                self.conn = snowflake.connector.connect(
+                conn = snowflake.connector.connect(
                     **self.config,
                     client_session_keep_alive=True,
                     network_timeout=15,
-                    login_timeout=15
+                    login_timeout=15,
+                    client_prefetch_threads=self.prefetch_threads,
+                    # Sent with the login request, so no extra round-trip
+                    session_parameters={"TIMEZONE": "UTC", "QUERY_TAG": "mcp-server"}
                 )
-                self.conn.cursor().execute("ALTER SESSION SET TIMEZONE = 'UTC'")
                 logger.info("New connection established and configured")
-            
-            # Test if connection is valid
-            try:
-                self.conn.cursor().execute("SELECT 1")
-            except:
-                logger.info("Connection lost, reconnecting...")
-                self.conn = None
-                return self.verify_link()
-                
-            return self.conn
-            
-        except Exception as e:
-            logger.error(f"Connection error: {str(e)}")
-            raise
+                return conn
+            except (OperationalError, InterfaceError) as e:
+                if attempt == CONNECT_ATTEMPTS - 1:
+                    logger.error("Connection error: %s", e)
+                    raise
+                delay = CONNECT_BACKOFF * 2 ** attempt + random.random() * 0.1
+                logger.warning("Connection attempt %d failed: %s; retrying in %.2fs", attempt + 1, e, delay)
+                time.sleep(delay)
     
+    def run_with_reconnect(self, method: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a read-only tool method, reconnecting once if the connection is dead.
+
+        Only use this for idempotent calls; a failed write is not replayed.
+        """
+        try:
+            return method(*args)
+        except (OperationalError, InterfaceError) as e:
+            # The pool has already discarded the dead connection
+            logger.info("Connection lost (%s), reconnecting...", e)
+            return method(*args)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the connection executor so the event loop is not blocked."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def db_call(self, method: Callable[..., Any], *args: Any, reconnect: bool = True) -> Any:
+        """
+        Run a tool method in a worker thread so the event loop is not blocked.
+
+        Read-only calls reconnect once on a dropped session; pass
+        ``reconnect=False`` for anything that may write.
+        """
+        if reconnect:
+            return await self.run_blocking(self.run_with_reconnect, method, *args)
+        return await self.run_blocking(method, *args)
+
     def cleanup(self) -> None:
-        """Safely close the database connection."""
-        if self.conn:
-            try:
-                self.conn.close()
-                logger.info("Connection closed")
-            except Exception as e:
-                logger.error(f"Error closing connection: {str(e)}")
-            finally:
-                self.conn = None
+        """Stop the worker threads and safely close the user session and all idle pooled connections."""
+        # Drop queued work such as pending pre-warms so nothing opens a session after shutdown
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pool.close_all()
+        self._close_session()
+
+    def _close_session(self) -> None:
+        """Close the dedicated user session, logging rather than raising on failure."""
+        conn, self._session = self._session, None
+        if conn is None:
+            return
+        try:
+            conn.close()
+        except Exception as e:
+            logger.error("Error closing session: %s", e)
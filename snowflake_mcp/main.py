@@ -7,12 +7,13 @@ query execution, and result formatting.
 """
 import asyncio
 import logging
+import os
 import mcp.server.stdio #this line is req in main.py
 from server import SnowflakeServer
 
-# Configure logging
+# Configure logging; set SNOWFLAKE_MCP_LOGLEVEL=DEBUG for verbose output
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("SNOWFLAKE_MCP_LOGLEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('snowflake_server')
@@ -33,7 +34,7 @@ async def start_service() -> None:
                 initialization_options
             )
     except Exception as e:
-        logger.critical(f"Server failed: {str(e)}", exc_info=True)
+        logger.critical("Server failed: %s", e, exc_info=True)
         raise
     finally:
         logger.info("Server shutting down")
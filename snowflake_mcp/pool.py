@@ -0,0 +1,117 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import snowflake.connector
+from snowflake.connector.errors import InterfaceError, OperationalError
+
+# Configure logging
+logger = logging.getLogger('snowflake_pool')
+
+
+class ConnectionPool:
+    """Thread-safe pool of Snowflake connections shared by all tool calls.
+
+    Connections are opened on demand, or ahead of time with warm(), up to
+    ``size`` and handed out one per checkout, so concurrent tool calls run on
+    separate sessions instead of queueing on a single connection. Connections
+    older than ``lifetime`` seconds are closed and replaced when next checked
+    out, so long-lived sessions are recycled before they go stale.
+
+    Every checkout starts from the session context (database, schema, role,
+    warehouse) the connection logged in with; a connection handed back in any
+    other context, e.g. after a USE statement, is closed instead of reused.
+    """
+
+    def __init__(self, connect: Callable[[], snowflake.connector.SnowflakeConnection], size: int,
+                 lifetime: Optional[float] = None) -> None:
+        self._connect = connect
+        self.size = size
+        self.lifetime = lifetime
+        # LIFO so the most recently used (warmest) connection is reused first;
+        # entries are (connection, time it was opened, session context at login)
+        self._idle: "queue.LifoQueue[tuple]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def checkout(self) -> Iterator[snowflake.connector.SnowflakeConnection]:
+        """
+        Borrow a connection for the duration of the block.
+
+        Blocks while all ``size`` connections are in use. A connection that
+        fails with a network-level error is closed instead of being returned.
+        """
+        self._slots.acquire()
+        conn = None
+        opened = 0.0
+        context = None
+        try:
+            try:
+                conn, opened, context = self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if conn is not None and self._expired(opened):
+                self._discard(conn)
+                conn = None
+            # is_closed() is a local check; a dead session surfaces on the next query
+            if conn is None or conn.is_closed():
+                conn, opened = self._connect(), time.monotonic()
+                context = self._session_context(conn)
+            yield conn
+        except (OperationalError, InterfaceError):
+            self._discard(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                if self._session_context(conn) == context:
+                    self._idle.put((conn, opened, context))
+                else:
+                    # The next borrower would resolve unqualified names somewhere else
+                    logger.info("Discarding connection whose session context changed")
+                    self._discard(conn)
+            self._slots.release()
+
+    def warm(self) -> None:
+        """Open one connection ahead of demand and park it as idle, if there is room."""
+        if self._idle.qsize() >= self.size or not self._slots.acquire(blocking=False):
+            return
+        try:
+            conn = self._connect()
+            self._idle.put((conn, time.monotonic(), self._session_context(conn)))
+        except Exception as e:
+            logger.warning("Could not pre-warm connection: %s", e)
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        """Close every idle connection; connections still checked out are left alone."""
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def _expired(self, opened: float) -> bool:
+        """Return True if a connection opened at ``opened`` has outlived the pool lifetime."""
+        return self.lifetime is not None and time.monotonic() - opened > self.lifetime
+
+    @staticmethod
+    def _session_context(conn: snowflake.connector.SnowflakeConnection) -> tuple:
+        """Return the current database, schema, role and warehouse the connector tracks for a session."""
+        return (conn.database, conn.schema, conn.role, conn.warehouse)
+
+    @staticmethod
+    def _discard(conn: snowflake.connector.SnowflakeConnection) -> None:
+        """Close a connection, logging rather than raising on failure."""
+        if conn is None:
+            return
+        try:
+            conn.close()
+            logger.info("Connection closed")
+        except Exception as e:
+            logger.error("Error closing connection: %s", e)
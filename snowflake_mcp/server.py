@@ -1,33 +1,348 @@
 import os
+import re
 import asyncio
 import logging
-import json
 import time
-import csv
-import pandas as pd
-from typing import Optional, Any, Dict, List
-from datetime import datetime
+from typing import Optional, Any, Callable, Dict, List, Tuple
 import mimetypes
 from pathlib import Path
-import snowflake.connector
+import jsonschema
+from cachetools import TLRUCache
 from dotenv import load_dotenv
-import mcp.server.stdio
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
-from mcp import types
 from pydantic import AnyUrl
 from connection import SnowflakeConnection
+from tools.utils import catalog_name, compress_text, dumps, dumps_rows
 
-# Configure logging
+# Configure logging; set SNOWFLAKE_MCP_LOGLEVEL=DEBUG for verbose output
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("SNOWFLAKE_MCP_LOGLEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+# The connector logs every request at INFO/DEBUG; keep it to warnings and errors
+logging.getLogger('snowflake.connector').setLevel(logging.WARNING)
 logger = logging.getLogger('snowflake_server')
 
 # Load environment variables
 load_dotenv()
 
+# Catalog results change rarely; serve repeat metadata calls from memory for a few minutes
+METADATA_CACHE_SIZE = 1024
+METADATA_CACHE_TTL = 300
+
+# Warehouse state, running queries and credit usage change from moment to moment,
+# so those results are only reused for a few seconds of back-to-back calls
+_CACHE_TTL_OVERRIDES = {"get_warehouse_info": 5}
+
+
+def _cache_expiry(key: Tuple, value: Any, now: float) -> float:
+    """Return when a metadata cache entry expires; keys start with the tool method's name."""
+    return now + _CACHE_TTL_OVERRIDES.get(key[0], METADATA_CACHE_TTL)
+
+# Statements that can change the catalog and therefore invalidate cached metadata
+_DDL_RE = re.compile(r'(?:^|;)\s*(?:CREATE|ALTER|DROP|UNDROP|RENAME|COMMENT|GRANT|REVOKE)\b', re.IGNORECASE)
+
+
+# Tool definitions are static, so build them once at import time rather than
+# on every list_tools request
+_TOOL_DEFINITIONS: Tuple[Tool, ...] = (
+    Tool(
+        name="process_req",
+        description="Execute a SQL query on Snowflake",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL query to execute"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="inspect_schema",
+        description="Get database schema information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Specific table name to inspect (optional)"
+                },
+                "schema_name": {
+                    "type": "string", 
+                    "description": "Schema name to inspect (optional)"
+                },
+                "refresh": {
+                    "type": "boolean",
+                    "description": "Drop cached metadata and re-read it from Snowflake (default: false)"
+                }
+            },
+            "required": ["table_name", "schema_name"]
+        }
+    ),
+    Tool(
+        name="analyze_performance",
+        description="Analyze query performance and suggest optimizations",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL query to analyze"
+                },
+                "explain_plan": {
+                    "type": "boolean",
+                    "description": "Include execution plan",
+                    "default": True
+                },
+                "include_history": {
+                    "type": "boolean",
+                    "description": "Include metrics from the most recent matching run in query history",
+                    "default": False
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="check_data_quality",
+        description="Run data quality checks on tables",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Table name to check"
+                }
+            },
+            "required": ["table_name"]
+        }
+    ),
+    Tool(
+        name="list_databases",
+        description="List all databases accessible to the current user",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="list_schemas",
+        description="List all schemas in a database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name (optional - if not provided, lists schemas from all databases)"
+                }
+            },
+            "required": ["database_name"]
+        }
+    ),
+    Tool(
+        name="list_tables",
+        description="List all tables in a database/schema",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name (optional)"
+                },
+                "schema_name": {
+                    "type": "string",
+                    "description": "Schema name (optional)"
+                },
+                "checks": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["null_check", "duplicate_check", "range_check", "format_check"]
+                    },
+                    "description": "Types of checks to perform",
+                    "default": ["null_check", "duplicate_check"]
+                }
+            },
+            "required": ["database_name", "schema_name"]
+        }
+    ),
+    Tool(
+        name="describe_table",
+        description="Get detailed information about a specific table including columns and metadata",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table to describe"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name (optional)"
+                },
+                "schema_name": {
+                    "type": "string",
+                    "description": "Schema name (optional)"
+                }
+            },
+            "required": ["table_name", "database_name", "schema_name"]
+        }
+    ),
+    Tool(
+        name="get_table_sample",
+        description="Get a sample of data from a table",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table to sample"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name (optional)"
+                },
+                "schema_name": {
+                    "type": "string",
+                    "description": "Schema name (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of rows to sample (default: 10, max: 100)",
+                    "minimum": 1,
+                    "maximum": 100
+                }
+            },
+            "required": ["table_name", "database_name", "schema_name"]
+        }
+    ),
+    Tool(
+        name="get_column_stats",
+        description="Get statistical information about a specific column",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table"
+                },
+                "column_name": {
+                    "type": "string",
+                    "description": "Name of the column"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name (optional)"
+                },
+                "schema_name": {
+                    "type": "string",
+                    "description": "Schema name (optional)"
+                }
+            },
+            "required": ["table_name", "column_name", "database_name", "schema_name"]
+        }
+    ),
+    Tool(
+        name="search_tables",
+        description="Search for tables by name or comment",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "search_term": {
+                    "type": "string",
+                    "description": "Term to search for in table names and comments"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name to limit search (optional)"
+                },
+                "account_wide": {
+                    "type": "boolean",
+                    "description": "Search every database via ACCOUNT_USAGE when no database is given; misses tables created in the last few hours (default: false)",
+                    "default": False
+                }
+            },
+            "required": ["search_term"]
+        }
+    ),
+    Tool(
+        name="search_columns",
+        description="Search for columns by name or comment",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "search_term": {
+                    "type": "string",
+                    "description": "Term to search for in column names and comments"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name to limit search (optional)"
+                },
+                "account_wide": {
+                    "type": "boolean",
+                    "description": "Search every database via ACCOUNT_USAGE when no database is given; misses columns created in the last few hours (default: false)",
+                    "default": False
+                }
+            },
+            "required": ["search_term"]
+        }
+    ),
+    Tool(
+        name="get_warehouse_info",
+        description="Get comprehensive information about available warehouses including usage statistics and performance metrics",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="create_stored_procedure",
+        description="Create a stored procedure in Snowflake from a .sql file",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql_file_path": {
+                    "type": "string",
+                    "description": "Path to the .sql file containing the stored procedure definition"
+                },
+                "database_name": {
+                    "type": "string",
+                    "description": "Database name to create the procedure in (optional)"
+                },
+                "schema_name": {
+                    "type": "string",
+                    "description": "Schema name to create the procedure in (optional)"
+                },
+                "replace_if_exists": {
+                    "type": "boolean",
+                    "description": "Replace procedure if it already exists (default: true)",
+                    "default": True
+                },
+                "include_procedure_info": {
+                    "type": "boolean",
+                    "description": "Look up the created procedure in INFORMATION_SCHEMA and include its details (default: false)",
+                    "default": False
+                }
+            },
+            "required": ["sql_file_path"]
+        }
+    )
+)
+
+# Argument validators compiled once per tool; the MCP server would otherwise
+# re-check each schema against the metaschema on every call
+_TOOL_VALIDATORS: Dict[str, Any] = {
+    tool.name: jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+    for tool in _TOOL_DEFINITIONS
+}
+
 
 class SnowflakeServer(Server):
     """MCP server that handles Snowflake database operations with metadata discovery."""
@@ -36,6 +351,16 @@ class SnowflakeServer(Server):
         """Initialize the MCP server with a Snowflake connection."""
         super().__init__(name="snowflake-server")
         self.db = SnowflakeConnection()
+        self._meta_cache = TLRUCache(maxsize=METADATA_CACHE_SIZE, ttu=_cache_expiry)
+        # Metadata fetches in progress, so concurrent identical calls share one query
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        # Bumped on invalidation so fetches started before a DDL are not cached
+        self._meta_generation = 0
+        # Unscoped lookups (no database or schema given) resolve against the context every
+        # pooled session logs in with, so it is part of every cache key
+        self._session_key = tuple(self.db.config.get(name) for name in ("account", "user", "database", "warehouse"))
+        # Handed out as-is on every list_tools request; clients only read it
+        self._tool_list: List[Tool] = list(_TOOL_DEFINITIONS)
         logger.info("SnowflakeServer initialized")
 
         @self.list_resources()
@@ -76,280 +401,35 @@ class SnowflakeServer(Server):
                     return [TextContent(type="text", text=text)]
                 return [TextContent(type="text", text=f"Binary resource. Use URI directly: file://{path.resolve()}")]
             except Exception as e:
-                logger.error(f"Failed to read resource {uri}: {e}")
+                logger.error("Failed to read resource %s: %s", uri, e)
                 return [TextContent(type="text", text=f"Error reading resource: {e}")]
     
 
         @self.list_tools()
         async def get_supported_operations():
             """Return list of available tools."""
-            return [
-                Tool(
-                    name="process_req",
-                    description="Execute a SQL query on Snowflake",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "SQL query to execute"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                Tool(
-                    name="inspect_schema",
-                    description="Get database schema information",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {
-                                "type": "string",
-                                "description": "Specific table name to inspect (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string", 
-                                "description": "Schema name to inspect (optional)"
-                            }
-                        },
-                        "required": ["table_name", "schema_name"]
-                    }
-                ),
-                Tool(
-                    name="analyze_performance",
-                    description="Analyze query performance and suggest optimizations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "SQL query to analyze"
-                            },
-                            "explain_plan": {
-                                "type": "boolean",
-                                "description": "Include execution plan",
-                                "default": True
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                Tool(
-                    name="check_data_quality",
-                    description="Run data quality checks on tables",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {
-                                "type": "string",
-                                "description": "Table name to check"
-                            }
-                        },
-                        "required": ["table_name"]
-                    }
-                ),
-                Tool(
-                    name="list_databases",
-                    description="List all databases accessible to the current user",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="list_schemas",
-                    description="List all schemas in a database",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name (optional - if not provided, lists schemas from all databases)"
-                            }
-                        },
-                        "required": ["database_name"]
-                    }
-                ),
-                Tool(
-                    name="list_tables",
-                    description="List all tables in a database/schema",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string",
-                                "description": "Schema name (optional)"
-                            },
-                            "checks": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string",
-                                    "enum": ["null_check", "duplicate_check", "range_check", "format_check"]
-                                },
-                                "description": "Types of checks to perform",
-                                "default": ["null_check", "duplicate_check"]
-                            }
-                        },
-                        "required": ["database_name", "schema_name"]
-                    }
-                ),
-                Tool(
-                    name="describe_table",
-                    description="Get detailed information about a specific table including columns and metadata",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {
-                                "type": "string",
-                                "description": "Name of the table to describe"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string",
-                                "description": "Schema name (optional)"
-                            }
-                        },
-                        "required": ["table_name", "database_name", "schema_name"]
-                    }
-                ),
-                Tool(
-                    name="get_table_sample",
-                    description="Get a sample of data from a table",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {
-                                "type": "string",
-                                "description": "Name of the table to sample"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string",
-                                "description": "Schema name (optional)"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of rows to sample (default: 10, max: 100)",
-                                "minimum": 1,
-                                "maximum": 100
-                            }
-                        },
-                        "required": ["table_name", "database_name", "schema_name"]
-                    }
-                ),
-                Tool(
-                    name="get_column_stats",
-                    description="Get statistical information about a specific column",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "table_name": {
-                                "type": "string",
-                                "description": "Name of the table"
-                            },
-                            "column_name": {
-                                "type": "string",
-                                "description": "Name of the column"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string",
-                                "description": "Schema name (optional)"
-                            }
-                        },
-                        "required": ["table_name", "column_name", "database_name", "schema_name"]
-                    }
-                ),
-                Tool(
-                    name="search_tables",
-                    description="Search for tables by name or comment",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "search_term": {
-                                "type": "string",
-                                "description": "Term to search for in table names and comments"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name to limit search (optional)"
-                            }
-                        },
-                        "required": ["search_term", "database_name"]
-                    }
-                ),
-                Tool(
-                    name="search_columns",
-                    description="Search for columns by name or comment",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "search_term": {
-                                "type": "string",
-                                "description": "Term to search for in column names and comments"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name to limit search (optional)"
-                            }
-                        },
-                        "required": ["search_term", "database_name"]
-                    }
-                ),
-                Tool(
-                    name="get_warehouse_info",
-                    description="Get comprehensive information about available warehouses including usage statistics and performance metrics",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="create_stored_procedure",
-                    description="Create a stored procedure in Snowflake from a .sql file",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "sql_file_path": {
-                                "type": "string",
-                                "description": "Path to the .sql file containing the stored procedure definition"
-                            },
-                            "database_name": {
-                                "type": "string",
-                                "description": "Database name to create the procedure in (optional)"
-                            },
-                            "schema_name": {
-                                "type": "string",
-                                "description": "Schema name to create the procedure in (optional)"
-                            },
-                            "replace_if_exists": {
-                                "type": "boolean",
-                                "description": "Replace procedure if it already exists (default: true)",
-                                "default": True
-                            }
-                        },
-                        "required": ["sql_file_path"]
-                    }
-                )
-            ]
-
-        @self.call_tool()
+            return self._tool_list
+
+        # Tool name -> adapter coroutine taking (arguments, start_time)
+        self._handlers = {
+            "process_req": self._process_req,
+            "list_databases": self._list_databases,
+            "list_schemas": self._list_schemas,
+            "list_tables": self._list_tables,
+            "describe_table": self._describe_table,
+            "get_table_sample": self._get_table_sample,
+            "get_column_stats": self._get_column_stats,
+            "search_tables": self._search_tables,
+            "search_columns": self._search_columns,
+            "get_warehouse_info": self._get_warehouse_info,
+            "create_stored_procedure": self._create_stored_procedure,
+            "inspect_schema": self._inspect_schema,
+            "analyze_performance": self._analyze_performance,
+            "check_data_quality": self._check_data_quality,
+        }
+
+        # Arguments are validated below with the precompiled _TOOL_VALIDATORS
+        @self.call_tool(validate_input=False)
         async def handle_operation(name: str, arguments: Dict[str, Any]):
             """
             Handle tool call requests by routing to specific methods.
@@ -362,156 +442,24 @@ class SnowflakeServer(Server):
                 List of TextContent objects with execution results
             """
                 
-            start_time = time.time()
+            validator = _TOOL_VALIDATORS.get(name)
+            if validator is not None:
+                error = jsonschema.exceptions.best_match(validator.iter_errors(arguments))
+                if error is not None:
+                    # Raised so the MCP server reports it as an error result, as its own check did
+                    raise ValueError(f"Input validation error: {error.message}")
+
+            start_time = time.perf_counter()
+            handler = self._handlers.get(name)
+            if handler is None:
+                return [TextContent(
+                    type="text",
+                    text=f"Unknown tool: {name}"
+                )]
             try:
-                if name == "process_req":
-                    result = self.db.process_request(arguments["query"])
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Query Results (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "list_databases":
-                    result = self.db.list_databases()
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Databases (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "list_schemas":
-                    database_name = arguments.get("database_name")
-                    result = self.db.list_schemas(database_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Schemas (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "list_tables":
-                    database_name = arguments.get("database_name")
-                    schema_name = arguments.get("schema_name")
-                    result = self.db.list_tables(database_name, schema_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Tables (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "describe_table":
-                    table_name = arguments["table_name"]
-                    database_name = arguments.get("database_name")
-                    schema_name = arguments.get("schema_name")
-                    result = self.db.describe_table(table_name, database_name, schema_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Table Description (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "get_table_sample":
-                    table_name = arguments["table_name"]
-                    database_name = arguments.get("database_name")
-                    schema_name = arguments.get("schema_name")
-                    limit = min(arguments.get("limit", 10), 100)  # Cap at 100 rows
-                    result = self.db.get_table_sample(table_name, database_name, schema_name, limit)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Table Sample (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "get_column_stats":
-                    table_name = arguments["table_name"]
-                    column_name = arguments["column_name"]
-                    database_name = arguments.get("database_name")
-                    schema_name = arguments.get("schema_name")
-                    result = self.db.get_column_stats(table_name, column_name, database_name, schema_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Column Statistics (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "search_tables":
-                    search_term = arguments["search_term"]
-                    database_name = arguments.get("database_name")
-                    result = self.db.search_tables(search_term, database_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Table Search Results (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "search_columns":
-                    search_term = arguments["search_term"]
-                    database_name = arguments.get("database_name")
-                    result = self.db.search_columns(search_term, database_name)
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    return [TextContent(
-                        type="text",
-                        text=f"Column Search Results (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "get_warehouse_info":
-                    result = self.db.get_warehouse_info()
-                    execution_time = time.time() - start_time
-                    
-                    # Convert datetime objects to strings to ensure JSON serialization works
-                    try:
-                        result_str = json.dumps(result, indent=2, default=str)
-                    except Exception as json_error:
-                        logger.error(f"JSON serialization error: {str(json_error)}")
-                        result_str = str(result)
-                    
-                    return [TextContent(
-                        type="text",
-                        text=f"Warehouse Information (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "create_stored_procedure":
-                    sql_file_path = arguments["sql_file_path"]
-                    database_name = arguments.get("database_name")
-                    schema_name = arguments.get("schema_name")
-                    replace_if_exists = arguments.get("replace_if_exists", True)
-                    
-                    result = self.db.create_stored_procedure_from_file(
-                        sql_file_path, database_name, schema_name, replace_if_exists
-                    )
-                    execution_time = time.time() - start_time
-                    result_str = json.dumps(result, indent=2, default=str)
-                    
-                    status = "SUCCESS" if result.get("success") else "FAILED"
-                    return [TextContent(
-                        type="text",
-                        text=f"Stored Procedure Creation {status} (execution time: {execution_time:.2f}s):\n{result_str}"
-                    )]
-                
-                elif name == "inspect_schema":
-                    return await self.handle_inspect_schema(arguments)
-                elif name == "analyze_performance":
-                    return await self.handle_analyze_performance(arguments)
-                elif name == "check_data_quality":
-                    return await self.handle_check_data_quality(arguments)
-                
-                else:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}"
-                    )]
-                    
+                return await handler(arguments, start_time)
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 error_message = f"Error executing {name}: {str(e)} (execution time: {execution_time:.2f}s)"
                 logger.error(error_message)
                 return [TextContent(
@@ -519,6 +467,201 @@ class SnowflakeServer(Server):
                     text=error_message
                 )]
 
+    @staticmethod
+    def _format_result(label: str, result: Any, start_time: float) -> List[TextContent]:
+        """Render a tool result as a labelled header followed by one JSON text block."""
+        execution_time = time.perf_counter() - start_time
+        # A separate header block means the serialized payload is never copied into a larger string
+        return [
+            TextContent(type="text", text=f"{label} (execution time: {execution_time:.2f}s):"),
+            TextContent(type="text", text=compress_text(dumps(result))),
+        ]
+
+    @staticmethod
+    def _format_rows(label: str, rows: List[Any], start_time: float,
+                     header: Optional[Dict[str, Any]] = None) -> List[TextContent]:
+        """Render row results as a label block, an optional JSON header block, then newline-delimited JSON chunks."""
+        execution_time = time.perf_counter() - start_time
+        content = [TextContent(type="text", text=f"{label} (execution time: {execution_time:.2f}s):")]
+        if header is not None:
+            content.append(TextContent(type="text", text=dumps(header)))
+        content.extend(TextContent(type="text", text=compress_text(chunk)) for chunk in dumps_rows(rows))
+        return content
+
+    @staticmethod
+    def _format_statements(label: str, results: List[Dict[str, Any]], start_time: float) -> List[TextContent]:
+        """Render process_request results: per statement a JSON header, then its rows as newline-delimited JSON chunks."""
+        execution_time = time.perf_counter() - start_time
+        content = [TextContent(type="text", text=f"{label} (execution time: {execution_time:.2f}s):")]
+        for result in results:
+            header = {key: value for key, value in result.items() if key != "rows"}
+            content.append(TextContent(type="text", text=dumps(header)))
+            content.extend(
+                TextContent(type="text", text=compress_text(chunk)) for chunk in dumps_rows(result.get("rows", ()))
+            )
+        return content
+
+    def _format_table(self, label: str, table: Dict[str, Any], start_time: float) -> List[TextContent]:
+        """Render a result_table() payload: column names in the header, then one tuple per row."""
+        return self._format_rows(label, table["rows"], start_time, header={"columns": table["columns"]})
+
+    async def _cached(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Return a cached metadata result, querying Snowflake only on a miss.
+
+        Concurrent misses for the same key wait on a single in-flight query.
+        """
+        key = self._cache_key(method, *args)
+        try:
+            return self._meta_cache[key]
+        except KeyError:
+            pass
+        task = self._inflight.get(key)
+        if task is None:
+            if asyncio.iscoroutinefunction(method):
+                task = asyncio.ensure_future(method(*args))
+            else:
+                task = asyncio.ensure_future(self.db.db_call(method, *args))
+            generation = self._meta_generation
+            task.add_done_callback(lambda t: self._finish_fetch(key, t, generation))
+            self._inflight[key] = task
+        # Shield so one cancelled caller does not cancel the query for the others
+        return await asyncio.shield(task)
+
+    def _cache_key(self, method: Callable[..., Any], *args: Any) -> Tuple:
+        """Return the metadata cache key for a call of ``method`` with ``args``."""
+        return (method.__name__, self._session_key, *args)
+
+    def _finish_fetch(self, key: Tuple, task: asyncio.Task, generation: int) -> None:
+        """Retire an in-flight metadata fetch and cache its result if still current."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation == self._meta_generation:
+            self._meta_cache[key] = task.result()
+
+    def invalidate_metadata_cache(self) -> None:
+        """Drop cached and in-flight metadata after a catalog change."""
+        self._meta_cache.clear()
+        self._inflight.clear()
+        self._meta_generation += 1
+
+    async def _process_req(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        query = arguments["query"]
+        try:
+            # The user's session, so their USE/SET/ALTER SESSION state persists between calls
+            result = await self.db.db_call(self.db.in_session, self.db.process_request, query, reconnect=False)
+        finally:
+            # DDL may have run even if a later statement failed
+            if _DDL_RE.search(query):
+                self.invalidate_metadata_cache()
+        return self._format_statements("Query Results", result, start_time)
+
+    async def _list_databases(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        result = await self._cached(self.db.list_databases)
+        return self._format_table("Databases", result, start_time)
+
+    async def _list_schemas(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        database_name = arguments.get("database_name")
+        result = await self._cached(self.db.list_schemas, database_name)
+        return self._format_table("Schemas", result, start_time)
+
+    async def _list_tables(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        database_name = arguments.get("database_name")
+        schema_name = arguments.get("schema_name")
+        result = await self._cached(self.db.list_tables, database_name, schema_name)
+        return self._format_table("Tables", result, start_time)
+
+    async def _describe_table(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        table_name = arguments["table_name"]
+        database_name = arguments.get("database_name")
+        schema_name = arguments.get("schema_name")
+        result = await self._cached(self.db.describe_table, table_name, database_name, schema_name)
+        return self._format_result("Table Description", result, start_time)
+
+    async def _get_table_sample(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        table_name = arguments["table_name"]
+        database_name = arguments.get("database_name")
+        schema_name = arguments.get("schema_name")
+        limit = min(arguments.get("limit", 10), 100)  # Cap at 100 rows
+        result = await self.db.db_call(self.db.get_table_sample, table_name, database_name, schema_name, limit)
+        # Columnar payload: one line per column, in the order given by the header's "columns"
+        data = result.pop("data")
+        return self._format_rows("Table Sample", data, start_time, header=result)
+
+    async def _get_column_stats(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        table_name = arguments["table_name"]
+        column_name = arguments["column_name"]
+        database_name = arguments.get("database_name")
+        schema_name = arguments.get("schema_name")
+        data_type = self._cached_column_type(table_name, column_name, database_name, schema_name)
+        result = await self.db.db_call(
+            self.db.get_column_stats, table_name, column_name, database_name, schema_name, data_type
+        )
+        return self._format_result("Column Statistics", result, start_time)
+
+    def _cached_column_type(self, table_name: str, column_name: str, database_name: Optional[str],
+                            schema_name: Optional[str]) -> Optional[str]:
+        """Return a column's data type if its table description is already cached, else None.
+
+        Never queries Snowflake: without a type, get_column_stats looks it up in the
+        same request as the stats.
+        """
+        description = self._meta_cache.get(self._cache_key(self.db.describe_table, table_name, database_name, schema_name))
+        if description is None:
+            return None
+        name = catalog_name(column_name)
+        return next((column.get("DATA_TYPE") for column in description["columns"] if column.get("COLUMN_NAME") == name), None)
+
+    async def _search_tables(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        search_term = arguments["search_term"]
+        database_name = arguments.get("database_name")
+        account_wide = arguments.get("account_wide", False)
+        result = await self._cached(self.db.search_tables, search_term, database_name, account_wide)
+        return self._format_table("Table Search Results", result, start_time)
+
+    async def _search_columns(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        search_term = arguments["search_term"]
+        database_name = arguments.get("database_name")
+        account_wide = arguments.get("account_wide", False)
+        result = await self._cached(self.db.search_columns, search_term, database_name, account_wide)
+        return self._format_table("Column Search Results", result, start_time)
+
+    async def _get_warehouse_info(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        result = await self._cached(self.db.get_warehouse_info)
+        return self._format_result("Warehouse Information", result, start_time)
+
+    async def _create_stored_procedure(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        sql_file_path = arguments["sql_file_path"]
+        database_name = arguments.get("database_name")
+        schema_name = arguments.get("schema_name")
+        replace_if_exists = arguments.get("replace_if_exists", True)
+        include_procedure_info = arguments.get("include_procedure_info", False)
+        
+        result = await self.db.db_call(
+            self.db.create_stored_procedure_from_file,
+            sql_file_path, database_name, schema_name, replace_if_exists, include_procedure_info,
+            reconnect=False
+        )
+        # Creating a procedure is DDL, so cached catalog lookups may now be stale
+        if result.get("success"):
+            self.invalidate_metadata_cache()
+        status = "SUCCESS" if result.get("success") else "FAILED"
+        return self._format_result(f"Stored Procedure Creation {status}", result, start_time)
+
+    async def _inspect_schema(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        if arguments.get("refresh"):
+            self.invalidate_metadata_cache()
+        table_name = arguments.get("table_name")
+        schema_name = arguments.get("schema_name", "PUBLIC")
+        return await self._cached(self.db.inspect_schema, schema_name, table_name)
+
+    async def _analyze_performance(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        return await self.db.handle_analyze_performance(arguments)
+
+    async def _check_data_quality(self, arguments: Dict[str, Any], start_time: float) -> List[TextContent]:
+        return await self.db.handle_check_data_quality(arguments)
+
     def __del__(self) -> None:
         """Clean up resources when the server is deleted."""
         if hasattr(self, 'db'):
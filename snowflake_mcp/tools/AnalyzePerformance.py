@@ -1,48 +1,61 @@
-import json
+import asyncio
 from typing import Any, Dict, List
 from mcp.types import TextContent
 
+from tools.utils import dumps
+
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 class AnalyzePerformance:
-     def handle_analyze_performance(self, arguments: Dict[str, Any]) -> List[TextContent]:
+     async def handle_analyze_performance(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Handle performance analysis."""
         query = arguments["query"]
         include_plan = arguments.get("explain_plan", True)
+        include_history = arguments.get("include_history", False)
         
         analysis_results = []
         
+        # Get query profile (if available) from the user's recent history; the query
+        # most likely ran on another pooled session, so the session history would miss it.
+        # Texts are compared with whitespace collapsed and any trailing ';' dropped.
+        profile_query = """
+        SELECT 
+            QUERY_ID,
+            QUERY_TEXT,
+            EXECUTION_TIME,
+            COMPILATION_TIME,
+            BYTES_SCANNED
+        FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(RESULT_LIMIT => 1000))
+        WHERE TRIM(REGEXP_REPLACE(RTRIM(TRIM(QUERY_TEXT), ';'), '[[:space:]]+', ' ')) = %s
+        ORDER BY START_TIME DESC 
+        LIMIT 1
+        """
+        query_text = " ".join(query.strip().rstrip(';').split())
+        
+        # The plan and the profile lookup are independent, so both round-trips overlap;
+        # the history lookup is opt-in since it is a metadata query of its own
+        calls = {}
+        if include_plan:
+            calls["plan"] = self.db_call(self.process_request, f"EXPLAIN {query}")
+        if include_history:
+            calls["profile"] = self.db_call(self.process_request, profile_query, (query_text,))
+        results = dict(zip(calls, await asyncio.gather(*calls.values(), return_exceptions=True)))
+        plan_result = results.get("plan")
+        profile_result = results.get("profile")
+        
         if include_plan:
-            # Get execution plan
-            explain_query = f"EXPLAIN {query}"
-            plan_result = self.db.process_request(explain_query)
+            if isinstance(plan_result, Exception):
+                raise plan_result
             analysis_results.append("Execution Plan:")
-            analysis_results.append(json.dumps(plan_result, indent=2, default=str))
+            analysis_results.append(dumps(plan_result))
         
-        # Get query profile (if available)
-        try:
-            profile_query = """
-            SELECT 
-                QUERY_TEXT,
-                EXECUTION_TIME,
-                COMPILATION_TIME,
-                BYTES_SCANNED
-            FROM INFORMATION_SCHEMA.QUERY_HISTORY 
-            WHERE QUERY_TEXT LIKE '%{}%'
-            ORDER BY START_TIME DESC 
-            LIMIT 1
-            """.format(query.replace("'", "''")[:100])
-            
-            profile_result = self.db.process_request(profile_query)
-            if profile_result:
-                analysis_results.append("\nRecent Performance Metrics:")
-                analysis_results.append(json.dumps(profile_result, indent=2, default=str))
-        except Exception as e:
-            # Note: logger not available, removed logging call
-            pass
+        # A missing profile is not an error; the plan alone is still useful
+        if profile_result and not isinstance(profile_result, Exception):
+            analysis_results.append("\nRecent Performance Metrics:")
+            analysis_results.append(dumps(profile_result))
         
         return [TextContent(
             type="text",
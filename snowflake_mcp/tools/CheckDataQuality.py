@@ -1,68 +1,116 @@
-import json
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Optional
 from mcp.types import TextContent
 
+from tools.utils import NUMERIC_TYPES, dumps, qualify, quote_identifier
+
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+_COLUMNS_SQL = """
+SELECT
+    COLUMN_NAME,
+    DATA_TYPE
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = %s
+AND TABLE_NAME = %s
+ORDER BY ORDINAL_POSITION
+"""
+
+
 class CheckDataQuality:
-    def handle_check_data_quality(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def handle_check_data_quality(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Handle data quality checks."""
         table_name = arguments["table_name"]
         schema_name = arguments.get("schema_name", "PUBLIC")
         checks = arguments.get("checks", ["null_check", "duplicate_check"])
-        
+
         quality_results = []
-        full_table_name = f"{schema_name}.{table_name}"
-        
-        for check in checks:
-            if check == "null_check":
-                # Check for nulls in each column
-                query = f"""
-                SELECT 
-                    COLUMN_NAME,
-                    SUM(CASE WHEN {full_table_name}.{'{COLUMN_NAME}'} IS NULL THEN 1 ELSE 0 END) as NULL_COUNT,
-                    COUNT(*) as TOTAL_COUNT
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                CROSS JOIN {full_table_name}
-                WHERE TABLE_SCHEMA = '{schema_name}' 
-                AND TABLE_NAME = '{table_name}'
-                GROUP BY COLUMN_NAME
-                """
-                
-            elif check == "duplicate_check":
-                # Check for duplicate rows
-                query = f"""
-                SELECT COUNT(*) as TOTAL_ROWS,
-                       COUNT(DISTINCT *) as UNIQUE_ROWS
-                FROM {full_table_name}
-                """
-                
-            elif check == "range_check":
-                # Basic range checks for numeric columns
-                query = f"""
-                SELECT 
-                    COLUMN_NAME,
-                    DATA_TYPE
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_SCHEMA = '{schema_name}' 
-                AND TABLE_NAME = '{table_name}'
-                AND DATA_TYPE IN ('NUMBER', 'FLOAT', 'INTEGER')
-                """
-                
+        full_table_name = qualify(schema_name, table_name)
+        checks = [c for c in checks if c in ("null_check", "duplicate_check", "range_check")]
+
+        # Column-level checks share one metadata lookup, started once and awaited by each
+        columns_task = None
+        if any(check != "duplicate_check" for check in checks):
+            columns_task = asyncio.ensure_future(
+                self._fetch_rows(_COLUMNS_SQL, (schema_name, table_name))
+            )
+
+        # Checks are independent, so fan them out and report in the requested order
+        results = await asyncio.gather(
+            *(self._run_check(check, full_table_name, columns_task) for check in checks),
+            return_exceptions=True
+        )
+
+        for check, result in zip(checks, results):
+            if isinstance(result, Exception):
+                quality_results.append(f"Error in {check}: {str(result)}")
             else:
-                continue
-            
-            try:
-                result = self.db.process_request(query)
                 quality_results.append(f"{check.replace('_', ' ').title()}:")
-                quality_results.append(json.dumps(result, indent=2, default=str))
-            except Exception as e:
-                quality_results.append(f"Error in {check}: {str(e)}")
-        
+                quality_results.append(dumps(result))
+
         return [TextContent(
             type="text",
             text="\n".join(quality_results)
-        )]
\ No newline at end of file
+        )]
+
+    async def _fetch_rows(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """Run a single statement off the event loop and return its rows as tuples."""
+        result = await self.db_call(self.process_request, query, params)
+        return result[0]["rows"] if result else []
+
+    async def _run_check(self, check: str, full_table_name: str,
+                         columns_task: Optional[asyncio.Future]) -> List[Dict[str, Any]]:
+        """Run one data quality check as a single aggregate pass over the table."""
+        if check == "duplicate_check":
+            # HASH(*) lets one scan count distinct rows; COUNT(DISTINCT *) is not valid Snowflake
+            rows = await self._fetch_rows(f"""
+            SELECT COUNT(*) as TOTAL_ROWS,
+                   COUNT(DISTINCT HASH(*)) as UNIQUE_ROWS
+            FROM {full_table_name}
+            """)
+            total_rows, unique_rows = rows[0]
+            return [{"TOTAL_ROWS": total_rows, "UNIQUE_ROWS": unique_rows}]
+
+        columns = await columns_task
+        if not columns:
+            raise ValueError(f"No applicable columns found for {full_table_name}")
+        if check == "range_check":
+            columns = [c for c in columns if c[1] in NUMERIC_TYPES]
+            if not columns:
+                # A table without numeric columns simply has no ranges to report
+                return []
+
+        # Rows of _COLUMNS_SQL are (COLUMN_NAME, DATA_TYPE)
+        names = [c[0] for c in columns]
+        if check == "null_check":
+            # Count nulls for every column in one pass instead of one scan per column
+            select_list = ", ".join(
+                f"SUM(CASE WHEN {quote_identifier(name)} IS NULL THEN 1 ELSE 0 END)" for name in names
+            )
+            rows = await self._fetch_rows(f"SELECT COUNT(*), {select_list} FROM {full_table_name}")
+            values = rows[0]
+            return [
+                {"COLUMN_NAME": name, "NULL_COUNT": null_count, "TOTAL_COUNT": values[0]}
+                for name, null_count in zip(names, values[1:])
+            ]
+
+        # range_check: fold MIN/MAX/AVG/STDDEV for all numeric columns into one pass
+        select_list = ", ".join(
+            f"MIN({column}), MAX({column}), AVG({column}), STDDEV({column})"
+            for column in map(quote_identifier, names)
+        )
+        rows = await self._fetch_rows(f"SELECT {select_list} FROM {full_table_name}")
+        values = rows[0]
+        return [
+            {
+                "COLUMN_NAME": name,
+                "MIN_VALUE": values[i * 4],
+                "MAX_VALUE": values[i * 4 + 1],
+                "AVG_VALUE": values[i * 4 + 2],
+                "STDDEV_VALUE": values[i * 4 + 3],
+            }
+            for i, name in enumerate(names)
+        ]
@@ -1,12 +1,52 @@
 import os
 import re
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from tools.utils import catalog_name, column_names, qualify
+
+# Whitespace and comments (--, // and /* */) that may precede the CREATE statement
+_LEADING_RE = re.compile(r'(?:\s+|--[^\n]*|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+
+# Name of the procedure a CREATE PROCEDURE statement defines, with optional qualifiers;
+# each part is a quoted identifier or a run that cannot cross whitespace, dots or '('.
+# Only matched at the start of the statement, never inside a body or comment
+_PROC_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:TEMP|TEMPORARY)\s+)?(?:SECURE\s+)?PROCEDURE\s+(?:IF\s+NOT\s+EXISTS\s+)?'
+    r'(?:(?P<db>"[^"]+"|[^\s."(]+)\.)?(?:(?P<sch>"[^"]+"|[^\s."(]+)\.)?(?P<name>"[^"]+"|[^\s."(]+)',
+    re.IGNORECASE
+)
+
+def _match_procedure(sql_content: str) -> Optional["re.Match[str]"]:
+    """Match the CREATE PROCEDURE header at the start of the statement, after any leading comments."""
+    return _PROC_RE.match(sql_content, _LEADING_RE.match(sql_content).end())
+
+def _target(match: "re.Match[str]", database_name: Optional[str],
+            schema_name: Optional[str]) -> Tuple[Optional[str], Optional[str], str]:
+    """
+    Return the database and schema the matched procedure is created in, and the
+    prefix that qualifies its name with them.
+
+    Qualifiers written in the SQL win, as they did under USE DATABASE/USE SCHEMA;
+    a database without a schema means its PUBLIC schema, which USE DATABASE selects.
+    """
+    # A two-part name fills the first group, so take whichever parts matched
+    qualifiers = [part for part in match.group("db", "sch") if part]
+    if len(qualifiers) == 2:
+        return qualifiers[0], qualifiers[1], ""
+    if len(qualifiers) == 1:
+        return database_name, qualifiers[0], f"{qualify(database_name)}." if database_name else ""
+    if database_name and not schema_name:
+        schema_name = "PUBLIC"
+    if database_name or schema_name:
+        return database_name, schema_name, f"{qualify(database_name, schema_name)}."
+    return None, None, ""
 
 
 class CreateStoredProcedure:
     def create_stored_procedure_from_file(self, sql_file_path: str, database_name: Optional[str] = None, 
-                                        schema_name: Optional[str] = None, replace_if_exists: bool = True) -> Dict[str, Any]:
+                                        schema_name: Optional[str] = None, replace_if_exists: bool = True,
+                                        include_procedure_info: bool = False) -> Dict[str, Any]:
         """Create a stored procedure in Snowflake from a .sql file."""
         
         # Validate file exists and is readable
@@ -17,88 +57,55 @@ class CreateStoredProcedure:
             raise ValueError(f"File must have .sql extension: {sql_file_path}")
         
         try:
-            # Read the SQL file content
-            with open(sql_file_path, 'r', encoding='utf-8') as file:
-                sql_content = file.read().strip()
+            # Read the SQL file content in one binary read and a single decode
+            with open(sql_file_path, 'rb') as file:
+                sql_content = file.read().decode('utf-8').strip()
                 
             if not sql_content:
                 raise ValueError(f"SQL file is empty: {sql_file_path}")
             
             # Try to extract procedure name from the SQL for better error reporting
             procedure_name = "UNKNOWN"
-            procedure_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:([^.]+)\.)?(?:([^.]+)\.)?([^\s(]+)'
-            match = re.search(procedure_pattern, sql_content, re.IGNORECASE | re.MULTILINE)
-            if match:
-                groups = match.groups()
-                if groups[2]:  # procedure name
-                    procedure_name = groups[2]
-                elif groups[1]:  # schema.procedure
-                    procedure_name = f"{groups[1]}.{groups[2]}" if groups[2] else groups[1]
-                elif groups[0]:  # database.schema.procedure
-                    parts = [g for g in groups if g]
-                    procedure_name = ".".join(parts)
-            
-            # Set database and schema context if provided
-            conn = self.verify_link()
+            lookup_name = procedure_name
+            target_database, target_schema = database_name, schema_name
             setup_commands = []
-            
-            if database_name:
-                setup_commands.append(f"USE DATABASE {database_name}")
-            if schema_name:
-                setup_commands.append(f"USE SCHEMA {schema_name}")
+            match = _match_procedure(sql_content)
+            if match:
+                # Create the procedure under a qualified name rather than switching the
+                # session's database/schema, so the requested context cannot be lost
+                target_database, target_schema, prefix = _target(match, database_name, schema_name)
+                name_start = match.start("db") if match["db"] else match.start("name")
+                sql_content = sql_content[:name_start] + prefix + sql_content[name_start:]
+                procedure_name = prefix + ".".join(part for part in match.group("db", "sch", "name") if part)
+                lookup_name = catalog_name(match["name"])
+            else:
+                # No recognizable name to qualify, so set the context in the same request instead
+                if database_name:
+                    setup_commands.append(f"USE DATABASE {database_name}")
+                if schema_name:
+                    setup_commands.append(f"USE SCHEMA {schema_name}")
             
             # Execute setup commands and the stored procedure creation
-            start_time = time.time()
+            start_time = time.perf_counter()
             results = []
             
-            with conn.cursor() as cursor:
-                # Set context
-                for setup_cmd in setup_commands:
-                    try:
-                        cursor.execute(setup_cmd)
-                        results.append({
-                            "statement": setup_cmd,
-                            "status": "success"
-                        })
-                    except Exception as e:
-                        # Note: logger not available in modular structure, skip logging
-                        pass
-                
+            with self.checkout() as conn, conn.cursor() as cursor:
                 # Execute the stored procedure creation
                 try:
-                    cursor.execute(sql_content)
-                    execution_time = time.time() - start_time
-                    
-                    # Get procedure information after creation
-                    proc_info_query = f"""
-                    SELECT 
-                        procedure_name,
-                        procedure_schema,
-                        procedure_catalog,
-                        argument_signature,
-                        data_type,
-                        created,
-                        last_altered,
-                        procedure_definition
-                    FROM information_schema.procedures 
-                    WHERE procedure_name = '{procedure_name.split('.')[-1]}'
-                    """
-                    
-                    if database_name:
-                        proc_info_query += f" AND procedure_catalog = '{database_name}'"
-                    if schema_name:
-                        proc_info_query += f" AND procedure_schema = '{schema_name}'"
+                    if setup_commands:
+                        # A failed switch stops the DDL from running elsewhere
+                        cursor.execute(";\n".join(setup_commands + [sql_content]),
+                                       num_statements=len(setup_commands) + 1)
+                        results.extend({"statement": cmd, "status": "success"} for cmd in setup_commands)
+                    else:
+                        cursor.execute(sql_content)
+                    execution_time = time.perf_counter() - start_time
                     
-                    proc_info_query += " ORDER BY created DESC LIMIT 1"
-                    
-                    try:
-                        cursor.execute(proc_info_query)
-                        proc_columns = [col[0] for col in cursor.description]
-                        proc_rows = cursor.fetchall()
-                        procedure_info = dict(zip(proc_columns, proc_rows[0])) if proc_rows else {}
-                    except Exception as e:
-                        # Note: logger not available, skip warning
-                        procedure_info = {}
+                    # The INFORMATION_SCHEMA lookup is a catalog query of its own, so only
+                    # run it when the caller asked for the details
+                    procedure_info = {}
+                    if include_procedure_info:
+                        procedure_info = self._procedure_info(cursor, lookup_name, target_database, target_schema)
                     
                     return {
                         "success": True,
@@ -113,7 +120,7 @@ class CreateStoredProcedure:
                     }
                     
                 except Exception as e:
-                    execution_time = time.time() - start_time
+                    execution_time = time.perf_counter() - start_time
                     error_message = f"Failed to create stored procedure: {str(e)}"
                     
                     return {
@@ -136,4 +143,47 @@ class CreateStoredProcedure:
                 "error": error_message,
                 "database_context": database_name,
                 "schema_context": schema_name
-            }
\ No newline at end of file
+            }
+
+    @staticmethod
+    def _procedure_info(cursor: Any, lookup_name: str, database_name: Optional[str],
+                        schema_name: Optional[str]) -> Dict[str, Any]:
+        """
+        Return the newest INFORMATION_SCHEMA entry for a procedure, or {} if it cannot be read.
+
+        ``database_name`` and ``schema_name`` are identifiers as written in SQL or
+        passed by the caller; they are compared in the form the catalog stores.
+        """
+        # The session is not switched to the target database, so name its INFORMATION_SCHEMA
+        view = qualify(database_name, "INFORMATION_SCHEMA", "PROCEDURES") if database_name else "information_schema.procedures"
+        proc_info_query = f"""
+        SELECT 
+            procedure_name,
+            procedure_schema,
+            procedure_catalog,
+            argument_signature,
+            data_type,
+            created,
+            last_altered,
+            procedure_definition
+        FROM {view} 
+        WHERE procedure_name = %s
+        """
+        proc_info_params = [lookup_name]
+        
+        if database_name:
+            proc_info_query += " AND procedure_catalog = %s"
+            proc_info_params.append(catalog_name(database_name))
+        if schema_name:
+            proc_info_query += " AND procedure_schema = %s"
+            proc_info_params.append(catalog_name(schema_name))
+        
+        proc_info_query += " ORDER BY created DESC LIMIT 1"
+        
+        try:
+            cursor.execute(proc_info_query, proc_info_params)
+            proc_columns = column_names(cursor)
+            proc_rows = cursor.fetchall()
+            return dict(zip(proc_columns, proc_rows[0])) if proc_rows else {}
+        except Exception:
+            return {}
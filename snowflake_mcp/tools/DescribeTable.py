@@ -1,25 +1,21 @@
 from typing import Optional, Any, Dict, List
 
+from snowflake.connector import DictCursor
+
+from tools.utils import qualify
+
 
 class DescribeTables:
     def describe_table(self, table_name: str, database_name: Optional[str] = None, schema_name: Optional[str] = None) -> Dict[str, Any]:
         """Get detailed information about a specific table."""
-        # Build fully qualified table name
-        parts = []
-        if database_name:
-            parts.append(database_name)
-        if schema_name:
-            parts.append(schema_name)
-        parts.append(table_name)
-        
-        full_table_name = '.'.join(parts)
+        full_table_name = qualify(database_name, schema_name, table_name)
         
         # Get column information
         table_query = f"""
         DESCRIBE TABLE {full_table_name}
         """
             
-        columns_query = f"""
+        columns_query = """
         SELECT 
             ordinal_position,
             column_name,
@@ -32,13 +28,16 @@ class DescribeTables:
             numeric_precision,
             numeric_scale
         FROM information_schema.columns
-        WHERE table_name = '{table_name}'
+        WHERE table_name = %s
         """
+        params = [table_name]
         
         if database_name:
-            columns_query += f" AND table_catalog = '{database_name}'"
+            columns_query += " AND table_catalog = %s"
+            params.append(database_name)
         if schema_name:
-            columns_query += f" AND table_schema = '{schema_name}'"
+            columns_query += " AND table_schema = %s"
+            params.append(schema_name)
             
         columns_query += " ORDER BY ordinal_position"
         
@@ -65,19 +64,16 @@ class DescribeTables:
         # if schema_name:
         #     table_query += f" AND table_schema = '{schema_name}'"
         
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor(DictCursor) as cursor:
+            # Send both statements in one request; results come back as successive result sets
+            cursor.execute(f"{table_query};{columns_query}", params, num_statements=2)
+
             # Get table metadata
-            cursor.execute(table_query)
-            table_columns = [col[0] for col in cursor.description]
-            table_rows = cursor.fetchall()
-            table_info = dict(zip(table_columns, table_rows[0])) if table_rows else {}
+            table_info = cursor.fetchone() or {}
             
             # Get column information
-            cursor.execute(columns_query)
-            col_columns = [col[0] for col in cursor.description]
-            col_rows = cursor.fetchall()
-            columns_info = [dict(zip(col_columns, row)) for row in col_rows]
+            cursor.nextset()
+            columns_info = cursor.fetchall()
             
         return {
             "table_info": table_info,
@@ -1,67 +1,84 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict
+
+from snowflake.connector import DictCursor
+
+from tools.utils import NUMERIC_TYPES, catalog_name, qualify
+
+NUMERIC_STAT_KEYS = ('AVG_VALUE', 'STDDEV_VALUE', 'MEDIAN_VALUE')
+
+_BASIC_STATS = """
+    COUNT(*) as total_count,
+    COUNT(IDENTIFIER(%(col)s)) as non_null_count,
+    COUNT(*) - COUNT(IDENTIFIER(%(col)s)) as null_count,
+    APPROX_COUNT_DISTINCT(IDENTIFIER(%(col)s)) as approx_distinct_count,
+    MIN(IDENTIFIER(%(col)s)) as min_value,
+    MAX(IDENTIFIER(%(col)s)) as max_value"""
+
+_NUMERIC_STATS = """
+    AVG(IDENTIFIER(%(col)s)) as avg_value,
+    STDDEV(IDENTIFIER(%(col)s)) as stddev_value,
+    MEDIAN(IDENTIFIER(%(col)s)) as median_value"""
+
+# Data type of the column, resolved like the unqualified table name would be
+_COLUMN_TYPE_SQL = """
+    SELECT data_type
+    FROM {view}
+    WHERE table_schema = COALESCE(%(schema)s, CURRENT_SCHEMA())
+      AND table_name = %(table)s
+      AND column_name = %(column)s"""
+
+# HyperLogLog keeps the distinct count cheap on high-cardinality columns. The numeric
+# aggregates only run on columns whose type is numeric, so they are exact and never
+# convert values
+_NUMERIC_COLUMN_SQL = f"SELECT {_BASIC_STATS},{_NUMERIC_STATS}\nFROM IDENTIFIER(%(tbl)s)"
+_OTHER_COLUMN_SQL = f"SELECT {_BASIC_STATS}\nFROM IDENTIFIER(%(tbl)s)"
+_NUMERIC_ONLY_SQL = f"SELECT {_NUMERIC_STATS}\nFROM IDENTIFIER(%(tbl)s)"
 
 
 class GetColumnStats:
     def get_column_stats(self, table_name: str, column_name: str, 
-                        database_name: Optional[str] = None, schema_name: Optional[str] = None) -> Dict[str, Any]:
-        """Get statistical information about a specific column."""
-        # Build fully qualified table name
-        parts = []
-        if database_name:
-            parts.append(database_name)
-        if schema_name:
-            parts.append(schema_name)
-        parts.append(table_name)
-        
-        full_table_name = '.'.join(parts)
-        
-        # Basic stats query
-        stats_query = f"""
-        SELECT 
-            COUNT(*) as total_count,
-            COUNT({column_name}) as non_null_count,
-            COUNT(*) - COUNT({column_name}) as null_count,
-            COUNT(DISTINCT {column_name}) as distinct_count,
-            MIN({column_name}) as min_value,
-            MAX({column_name}) as max_value
-        FROM {full_table_name}
+                        database_name: Optional[str] = None, schema_name: Optional[str] = None,
+                        data_type: Optional[str] = None) -> Dict[str, Any]:
+        """Get statistical information about a specific column.
+
+        ``data_type`` is the column's type if the caller already knows it; otherwise
+        it is looked up in the same request as the stats. It picks whether the
+        numeric aggregates run at all.
         """
+        full_table_name = qualify(database_name, schema_name, table_name)
+        column = qualify(column_name)
+        
+        params = {"tbl": full_table_name, "col": column}
         
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
-            try:
-                cursor.execute(stats_query)
-                columns = [col[0] for col in cursor.description]
-                row = cursor.fetchone()
-                basic_stats = dict(zip(columns, row))
-                
-                # Try to get additional numeric stats if applicable
+        # The names are bound as IDENTIFIER() arguments, so the connector escapes them as
+        # string literals and they cannot alter the statement
+        with self.checkout() as conn, conn.cursor(DictCursor) as cursor:
+            if data_type is not None:
+                numeric = data_type.upper() in NUMERIC_TYPES
+                cursor.execute(_NUMERIC_COLUMN_SQL if numeric else _OTHER_COLUMN_SQL, params)
+                basic_stats = cursor.fetchone()
+                numeric_stats = {key: basic_stats.pop(key) for key in NUMERIC_STAT_KEYS if key in basic_stats}
+            else:
+                # Look the type up in the same request as the type-neutral stats, then
+                # scan again for the numeric aggregates only if the column is numeric
+                view = qualify(database_name, "INFORMATION_SCHEMA", "COLUMNS") if database_name else "information_schema.columns"
+                params.update(
+                    schema=catalog_name(schema_name) if schema_name else None,
+                    table=catalog_name(table_name),
+                    column=catalog_name(column_name),
+                )
+                cursor.execute(f"{_COLUMN_TYPE_SQL.format(view=view)};{_OTHER_COLUMN_SQL}", params, num_statements=2)
+                type_row = cursor.fetchone()
+                cursor.nextset()
+                basic_stats = cursor.fetchone()
                 numeric_stats = {}
-                try:
-                    numeric_query = f"""
-                    SELECT 
-                        AVG({column_name}) as avg_value,
-                        STDDEV({column_name}) as stddev_value,
-                        MEDIAN({column_name}) as median_value
-                    FROM {full_table_name}
-                    WHERE {column_name} IS NOT NULL
-                    """
-                    cursor.execute(numeric_query)
-                    num_columns = [col[0] for col in cursor.description]
-                    num_row = cursor.fetchone()
-                    if num_row:
-                        numeric_stats = dict(zip(num_columns, num_row))
-                except:
-                    # Column is not numeric, skip numeric stats
-                    pass
-                
-                return {
-                    "table_name": full_table_name,
-                    "column_name": column_name,
-                    "basic_stats": basic_stats,
-                    "numeric_stats": numeric_stats
-                }
-                
-            except Exception as e:
-                # Note: logger not available, removed logging call
-                raise
\ No newline at end of file
+                if type_row and type_row["DATA_TYPE"].upper() in NUMERIC_TYPES:
+                    cursor.execute(_NUMERIC_ONLY_SQL, params)
+                    numeric_stats = cursor.fetchone()
+            
+        return {
+            "table_name": full_table_name,
+            "column_name": column_name,
+            "basic_stats": basic_stats,
+            "numeric_stats": numeric_stats
+        }
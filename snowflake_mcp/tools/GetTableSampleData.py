@@ -1,31 +1,27 @@
 from typing import Optional, Any, Dict, List
 
+from tools.utils import column_names, qualify
+
 
 class GetTableSample:
     def get_table_sample(self, table_name: str, database_name: Optional[str] = None, 
                         schema_name: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
         """Get a sample of data from a table."""
-        # Build fully qualified table name
-        parts = []
-        if database_name:
-            parts.append(database_name)
-        if schema_name:
-            parts.append(schema_name)
-        parts.append(table_name)
-        
-        full_table_name = '.'.join(parts)
+        full_table_name = qualify(database_name, schema_name, table_name)
         
-        query = f"SELECT * FROM {full_table_name} LIMIT {limit}"
+        # LIMIT lets Snowflake stop after the first rows it reads; SAMPLE (n ROWS) is
+        # Bernoulli sampling and would have to consider every row in the table
+        query = f"SELECT * FROM {full_table_name} LIMIT {int(limit)}"
         
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor() as cursor:
             cursor.execute(query)
-            columns = [col[0] for col in cursor.description]
+            columns = column_names(cursor)
             rows = cursor.fetchall()
             
         return {
             "table_name": full_table_name,
             "columns": columns,
-            "sample_data": [dict(zip(columns, row)) for row in rows],
+            # One list per column so column names are not repeated in every row
+            "data": [list(values) for values in zip(*rows)] if rows else [[] for _ in columns],
             "sample_size": len(rows)
         }
\ No newline at end of file
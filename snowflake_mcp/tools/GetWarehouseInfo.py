@@ -1,101 +1,89 @@
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from tools.utils import column_names
+
+
+# Usage statistics for all warehouses in one pass (last 30 days)
+_USAGE_SQL = """
+SELECT
+    warehouse_name,
+    COALESCE(SUM(credits_used), 0) as "total_credits_used",
+    COALESCE(SUM(credits_used_compute), 0) as "compute_credits_used",
+    COALESCE(SUM(credits_used_cloud_services), 0) as "cloud_services_credits_used",
+    COUNT(DISTINCT DATE(start_time)) as "active_days",
+    MAX(end_time) as "last_used",
+    COALESCE(AVG(credits_used), 0) as "avg_credits_per_hour"
+FROM snowflake.account_usage.warehouse_metering_history
+WHERE start_time >= DATEADD(day, -30, CURRENT_TIMESTAMP())
+GROUP BY warehouse_name
+"""
+
+# Load statistics for all warehouses in one pass (last 7 days)
+_LOAD_SQL = """
+SELECT
+    warehouse_name,
+    COALESCE(AVG(avg_running), 0) as "avg_running_queries",
+    COALESCE(AVG(avg_queued_load), 0) as "avg_queued_load",
+    COALESCE(AVG(avg_queued_provisioning), 0) as "avg_queued_provisioning",
+    COALESCE(AVG(avg_blocked), 0) as "avg_blocked_queries"
+FROM snowflake.account_usage.warehouse_load_history
+WHERE start_time >= DATEADD(day, -7, CURRENT_TIMESTAMP())
+GROUP BY warehouse_name
+"""
 
 
 class GetWarehouseInfo:
     def get_warehouse_info(self) -> Dict[str, Any]:
         """Get comprehensive information about available warehouses including usage statistics."""
-        conn = self.verify_link()
-        
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor() as cursor:
+            # Submit both history queries first so they run while SHOW WAREHOUSES is read
+            usage_query_id = self._submit_history_query(cursor, _USAGE_SQL)
+            load_query_id = self._submit_history_query(cursor, _LOAD_SQL)
+
             # Get basic warehouse info
             cursor.execute("SHOW WAREHOUSES")
-            columns = [col[0] for col in cursor.description]
+            columns = column_names(cursor)
             rows = cursor.fetchall()
             warehouses = [dict(zip(columns, row)) for row in rows]
-            
-            # Enhance each warehouse with usage statistics
+
+            usage_by_warehouse = self._history_by_warehouse(cursor, usage_query_id)
+            load_by_warehouse = self._history_by_warehouse(cursor, load_query_id)
+
+            # Enhance each warehouse with usage statistics, tallying the summary in the same pass
             enhanced_warehouses = []
             total_credits = 0
-            
+            active_warehouses = 0
+            default_warehouse = None
+
             for warehouse in warehouses:
                 warehouse_name = warehouse['name']
-                enhanced = warehouse.copy()
-                
-                # Initialize default usage stats
-                enhanced['usage_stats'] = {
+                # Each row dict was built above for this result, so extend it in place
+                enhanced = warehouse
+
+                # Fall back to default stats for warehouses with no recent history
+                enhanced['usage_stats'] = usage_by_warehouse.get(warehouse_name, {
                     'total_credits_used': 0,
                     'compute_credits_used': 0,
                     'cloud_services_credits_used': 0,
                     'active_days': 0,
                     'last_used': None,
                     'avg_credits_per_hour': 0
-                }
-                
-                enhanced['load_stats'] = {
+                })
+
+                enhanced['load_stats'] = load_by_warehouse.get(warehouse_name, {
                     'avg_running_queries': 0,
                     'avg_queued_load': 0,
                     'avg_queued_provisioning': 0,
                     'avg_blocked_queries': 0
-                }
-                
-                # Try to get usage statistics from account usage (last 30 days)
-                try:
-                    usage_query = f"""
-                    SELECT 
-                        COALESCE(SUM(credits_used), 0) as total_credits_used,
-                        COALESCE(SUM(credits_used_compute), 0) as compute_credits_used,
-                        COALESCE(SUM(credits_used_cloud_services), 0) as cloud_services_credits_used,
-                        COUNT(DISTINCT DATE(start_time)) as active_days,
-                        MAX(end_time) as last_used,
-                        COALESCE(AVG(credits_used), 0) as avg_credits_per_hour
-                    FROM snowflake.account_usage.warehouse_metering_history
-                    WHERE warehouse_name = '{warehouse_name}' 
-                    AND start_time >= DATEADD(day, -30, CURRENT_TIMESTAMP())
-                    """
-                    
-                    cursor.execute(usage_query)
-                    usage_row = cursor.fetchone()
-                    if usage_row:
-                        usage_columns = [col[0] for col in cursor.description]
-                        usage_data = dict(zip(usage_columns, usage_row))
-                        enhanced['usage_stats'] = usage_data
-                        total_credits += usage_data.get('total_credits_used', 0) or 0
-                        
-                except Exception as e:
-                    # Note: logger not available, removed logging call
-                    pass
-                
-                # Try to get load statistics (last 7 days)
-                try:
-                    load_query = f"""
-                    SELECT 
-                        COALESCE(AVG(avg_running), 0) as avg_running_queries,
-                        COALESCE(AVG(avg_queued_load), 0) as avg_queued_load,
-                        COALESCE(AVG(avg_queued_provisioning), 0) as avg_queued_provisioning,
-                        COALESCE(AVG(avg_blocked), 0) as avg_blocked_queries
-                    FROM snowflake.account_usage.warehouse_load_history
-                    WHERE warehouse_name = '{warehouse_name}'
-                    AND start_time >= DATEADD(day, -7, CURRENT_TIMESTAMP())
-                    """
-                    
-                    cursor.execute(load_query)
-                    load_row = cursor.fetchone()
-                    if load_row:
-                        load_columns = [col[0] for col in cursor.description]
-                        load_data = dict(zip(load_columns, load_row))
-                        enhanced['load_stats'] = load_data
-                        
-                except Exception as e:
-                    # Note: logger not available, removed logging call
-                    pass
-                
+                })
+
+                total_credits += enhanced['usage_stats'].get('total_credits_used', 0) or 0
+                if enhanced['state'] != 'SUSPENDED':
+                    active_warehouses += 1
+                if default_warehouse is None and enhanced.get('is_default') == 'Y':
+                    default_warehouse = warehouse_name
                 enhanced_warehouses.append(enhanced)
-            
-            # Calculate summary statistics
-            active_warehouses = len([w for w in enhanced_warehouses if w['state'] != 'SUSPENDED'])
-            default_warehouse = next((w['name'] for w in enhanced_warehouses if w.get('is_default') == 'Y'), None)
-            
+
             return {
                 'warehouses': enhanced_warehouses,
                 'summary': {
@@ -109,4 +97,26 @@ class GetWarehouseInfo:
                         'load_stats': 'Last 7 days'
                     }
                 }
-            }
\ No newline at end of file
+            }
+
+    @staticmethod
+    def _submit_history_query(cursor: Any, query: str) -> Optional[str]:
+        """Start an ACCOUNT_USAGE query without waiting for it; None if it could not be submitted."""
+        try:
+            cursor.execute_async(query)
+            return cursor.sfqid
+        except Exception:
+            # ACCOUNT_USAGE needs extra privileges; the stats fall back to defaults
+            return None
+
+    @staticmethod
+    def _history_by_warehouse(cursor: Any, query_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        """Wait for a submitted history query and index its rows by warehouse name."""
+        if query_id is None:
+            return {}
+        try:
+            cursor.get_results_from_sfqid(query_id)
+            stat_columns = column_names(cursor)[1:]
+            return {row[0]: dict(zip(stat_columns, row[1:])) for row in cursor.fetchall()}
+        except Exception:
+            return {}
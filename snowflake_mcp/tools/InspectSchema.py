@@ -1,43 +1,51 @@
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from mcp.types import TextContent
 
+from tools.utils import dumps
+
+_INSPECT_TABLE_SQL = """
+SELECT
+    COLUMN_NAME,
+    DATA_TYPE,
+    IS_NULLABLE,
+    COLUMN_DEFAULT
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = %s
+AND TABLE_NAME = %s
+ORDER BY ORDINAL_POSITION
+"""
+
+_INSPECT_SCHEMA_SQL = """
+SELECT
+    TABLE_NAME,
+    TABLE_TYPE,
+    ROW_COUNT,
+    BYTES
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = %s
+ORDER BY TABLE_NAME
+"""
+
 
 class InspectSchema:
-    def handle_inspect_schema(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def handle_inspect_schema(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Handle schema inspection."""
         table_name = arguments.get("table_name")
         schema_name = arguments.get("schema_name", "PUBLIC")
-        
+        return await self.inspect_schema(schema_name, table_name)
+
+    async def inspect_schema(self, schema_name: str, table_name: Optional[str] = None) -> List[TextContent]:
+        """Describe one table's columns, or every table in the schema when no table is given."""
         if table_name:
             # Get specific table info
-            query = f"""
-            SELECT 
-                COLUMN_NAME,
-                DATA_TYPE,
-                IS_NULLABLE,
-                COLUMN_DEFAULT
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_SCHEMA = '{schema_name}' 
-            AND TABLE_NAME = '{table_name}'
-            ORDER BY ORDINAL_POSITION
-            """
+            query, params = _INSPECT_TABLE_SQL, (schema_name, table_name)
         else:
             # Get all tables in schema
-            query = f"""
-            SELECT 
-                TABLE_NAME,
-                TABLE_TYPE,
-                ROW_COUNT,
-                BYTES
-            FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_SCHEMA = '{schema_name}'
-            ORDER BY TABLE_NAME
-            """
+            query, params = _INSPECT_SCHEMA_SQL, (schema_name,)
         
-        result = self.db.process_request(query)
+        result = await self.db_call(self.process_request, query, params)
         
         return [TextContent(
             type="text",
-            text=f"Schema information:\n{json.dumps(result, indent=2, default=str)}"
+            text=f"Schema information:\n{dumps(result)}"
         )]
\ No newline at end of file
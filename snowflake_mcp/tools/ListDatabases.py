@@ -1,14 +1,13 @@
-from typing import Any, Dict, List
+from typing import Any, Dict
+
+from tools.utils import result_table
 
 
 class ListDatabases:
 
-    def list_databases(self) -> List[Dict[str, Any]]:
+    def list_databases(self) -> Dict[str, Any]:
         """List all databases accessible to the current user."""
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor() as cursor:
             cursor.execute("SHOW DATABASES")
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
+            return result_table(cursor)
     
\ No newline at end of file
@@ -1,15 +1,14 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict
+
+from tools.utils import qualify, result_table
 
 
 class ListSchemas:
-    def list_schemas(self, database_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_schemas(self, database_name: Optional[str] = None) -> Dict[str, Any]:
         """List all schemas in a database."""
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor() as cursor:
             if database_name:
-                cursor.execute(f"SHOW SCHEMAS IN DATABASE {database_name}")
+                cursor.execute(f"SHOW SCHEMAS IN DATABASE {qualify(database_name)}")
             else:
                 cursor.execute("SHOW SCHEMAS")
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
\ No newline at end of file
+            return result_table(cursor)
\ No newline at end of file
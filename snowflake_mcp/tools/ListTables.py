@@ -1,18 +1,17 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict
 
 from dotenv import load_dotenv
 
+from tools.utils import qualify, result_table
+
 class ListTables:
-    def list_tables(self, database_name: Optional[str] = None, schema_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_tables(self, database_name: Optional[str] = None, schema_name: Optional[str] = None) -> Dict[str, Any]:
         """List all tables in a database/schema."""
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
+        with self.checkout() as conn, conn.cursor() as cursor:
             if database_name and schema_name:
-                cursor.execute(f"SHOW TABLES IN SCHEMA {database_name}.{schema_name}")
+                cursor.execute(f"SHOW TABLES IN SCHEMA {qualify(database_name, schema_name)}")
             elif database_name:
-                cursor.execute(f"SHOW TABLES IN DATABASE {database_name}")
+                cursor.execute(f"SHOW TABLES IN DATABASE {qualify(database_name)}")
             else:
                 cursor.execute("SHOW TABLES")
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
\ No newline at end of file
+            return result_table(cursor)
\ No newline at end of file
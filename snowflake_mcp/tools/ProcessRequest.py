@@ -1,47 +1,78 @@
-import json
-import time
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from tools.utils import column_names
+
+# Statements that modify data or schema and report affected rows instead of a result set
+_WRITE_RE = re.compile(r'\s*(?:INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|MERGE|TRUNCATE)\b', re.IGNORECASE)
+
+# Writes that can share a transaction; DDL commits implicitly in Snowflake, so it never can
+_DML_RE = re.compile(r'\s*(?:INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
 
 class ProcessReq:
-    def process_request(self, command: str) -> List[Dict[str, Any]]:
-        """Execute SQL statements and return results."""
+    def process_request(self, command: str, params: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """Execute SQL statements and return results.
+
+        Each read statement yields its column names once under ``columns`` and
+        its rows as tuples in that order under ``rows``.
+
+        When ``params`` is given, ``command`` is run as a single statement with
+        ``%s`` placeholders bound by the connector.
+        """
         # Split the command into individual statements
-        statements = [stmt.strip() for stmt in command.split(';') if stmt.strip()]
+        if params is not None:
+            statements = [command.strip()]
+        else:
+            statements = [stmt.strip() for stmt in command.split(';') if stmt.strip()]
         results = []
-        conn = self.verify_link()
-        start_time = time.time()
-
-        with conn.cursor() as cursor:
-            for stmt in statements:
-                is_write_operation = any(
-                    stmt.strip().upper().startswith(word)
-                    for word in ['INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER']
-                )
-                try:
-                    if is_write_operation:
-                        cursor.execute("BEGIN")
-                        try:
-                            cursor.execute(stmt)
-                            conn.commit()
-                            results.append({"statement": stmt, "affected_rows": cursor.rowcount})
-                        except Exception as e:
-                            conn.rollback()
-                            raise
+        with self.checkout() as conn, conn.cursor() as cursor:
+            # Consecutive DML statements share one transaction: BEGIN before the first,
+            # COMMIT before any other statement or at the end, ROLLBACK of that group on
+            # error. DDL and reads run on their own, after the open group is committed.
+            in_transaction = False
+            try:
+                for stmt in statements:
+                    if self._is_dml(stmt):
+                        if not in_transaction:
+                            cursor.execute("BEGIN")
+                            in_transaction = True
+                        cursor.execute(stmt, params)
+                        results.append({"statement": stmt, "affected_rows": cursor.rowcount})
+                        continue
+                    if in_transaction:
+                        conn.commit()
+                        in_transaction = False
+                    cursor.execute(stmt, params)
+                    if self._is_write_operation(stmt):
+                        results.append({"statement": stmt, "affected_rows": cursor.rowcount})
                     else:
-                        cursor.execute(stmt)
-                        if cursor.description:
-                            columns = [col[0] for col in cursor.description]
-                            rows = cursor.fetchall()
-                            results.append({
-                                "statement": stmt,
-                                "rows": [dict(zip(columns, row)) for row in rows]
-                            })
-                        else:
-                            results.append({"statement": stmt, "rows": []})
-                except Exception as e:
-                    # Note: logger not available, removed logging call
-                    raise
-
-        execution_time = time.time() - start_time
+                        results.append(self._read_result_set(stmt, cursor))
+                if in_transaction:
+                    conn.commit()
+            except Exception:
+                if in_transaction:
+                    conn.rollback()
+                raise
+
         # Note: logger not available, removed logging call
-        return results
\ No newline at end of file
+        return results
+
+    @staticmethod
+    def _is_write_operation(stmt: str) -> bool:
+        """Return True if the statement modifies data or schema."""
+        return _WRITE_RE.match(stmt) is not None
+
+    @staticmethod
+    def _is_dml(stmt: str) -> bool:
+        """Return True if the statement modifies data and can run inside a transaction."""
+        return _DML_RE.match(stmt) is not None
+
+    @staticmethod
+    def _read_result_set(stmt: str, cursor: Any) -> Dict[str, Any]:
+        """Read the current result set, if any, as column names plus tuple rows."""
+        columns = []
+        rows = []
+        if cursor.description:
+            columns = column_names(cursor)
+            rows = cursor.fetchall()
+        return {"statement": stmt, "columns": columns, "rows": rows}
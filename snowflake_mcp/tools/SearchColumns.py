@@ -1,11 +1,47 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict
 
 from dotenv import load_dotenv
 
+from tools.utils import ACCOUNT_SEARCH_LIMIT, result_table
+
+# Every database in the account in one query; needs ACCOUNT_USAGE access and
+# lags recent DDL by up to a couple of hours, so it is only used on request
+_ACCOUNT_COLUMNS_SQL = f"""
+SELECT
+    table_catalog as database_name,
+    table_schema as schema_name,
+    table_name,
+    column_name,
+    data_type,
+    comment
+FROM snowflake.account_usage.columns
+WHERE deleted IS NULL
+AND {{match}}
+ORDER BY table_catalog, table_schema, table_name, ordinal_position
+LIMIT {ACCOUNT_SEARCH_LIMIT}
+"""
+
+# Column name or comment contains the bound, upper-cased term
+_CONTAINS_MATCH = "(CONTAINS(UPPER(column_name), %s) OR CONTAINS(UPPER(comment), %s))"
+_LIKE_MATCH = "(UPPER(column_name) LIKE %s OR UPPER(comment) LIKE %s)"
+
 
 class SearchColumns:
-    def search_columns(self, search_term: str, database_name: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for columns by name or comment."""
+    def search_columns(self, search_term: str, database_name: Optional[str] = None,
+                       account_wide: bool = False) -> Dict[str, Any]:
+        """Search for columns by name or comment.
+
+        With ``account_wide`` and no ``database_name``, every database is searched
+        through ACCOUNT_USAGE, which does not yet show recently created columns.
+        """
+        if '%' in search_term or '_' in search_term:
+            # Keep LIKE so wildcards in the term still apply
+            match, term = _LIKE_MATCH, f"%{search_term.upper()}%"
+        else:
+            # A plain substring test is cheaper for Snowflake than LIKE '%...%'
+            match, term = _CONTAINS_MATCH, search_term.upper()
+        params = [term, term]
+        
         query = f"""
         SELECT 
             table_catalog as database_name,
@@ -15,18 +51,18 @@ class SearchColumns:
             data_type,
             comment
         FROM information_schema.columns
-        WHERE (UPPER(column_name) LIKE UPPER('%{search_term}%')
-           OR UPPER(comment) LIKE UPPER('%{search_term}%'))
+        WHERE {match}
         """
         
         if database_name:
-            query += f" AND table_catalog = '{database_name}'"
+            query += " AND table_catalog = %s"
+            params.append(database_name)
             
         query += " ORDER BY table_catalog, table_schema, table_name, ordinal_position"
         
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
-            cursor.execute(query)
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
\ No newline at end of file
+        if account_wide and not database_name:
+            query = _ACCOUNT_COLUMNS_SQL.format(match=match)
+        
+        with self.checkout() as conn, conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return result_table(cursor)
@@ -1,10 +1,36 @@
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict
+
+from tools.utils import ACCOUNT_SEARCH_LIMIT, result_table
+
+# Every database in the account in one query; needs ACCOUNT_USAGE access and
+# lags recent DDL by up to a couple of hours, so it is only used on request
+_ACCOUNT_TABLES_SQL = f"""
+SELECT
+    table_catalog as database_name,
+    table_schema as schema_name,
+    table_name,
+    table_type,
+    comment,
+    row_count,
+    bytes
+FROM snowflake.account_usage.tables
+WHERE deleted IS NULL
+AND (UPPER(table_name) LIKE %s
+   OR UPPER(comment) LIKE %s)
+ORDER BY table_catalog, table_schema, table_name
+LIMIT {ACCOUNT_SEARCH_LIMIT}
+"""
 
 
 class SearchTables:
-     def search_tables(self, search_term: str, database_name: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for tables by name or comment."""
-        query = f"""
+     def search_tables(self, search_term: str, database_name: Optional[str] = None,
+                       account_wide: bool = False) -> Dict[str, Any]:
+        """Search for tables by name or comment.
+
+        With ``account_wide`` and no ``database_name``, every database is searched
+        through ACCOUNT_USAGE, which does not yet show recently created tables.
+        """
+        query = """
         SELECT 
             table_catalog as database_name,
             table_schema as schema_name,
@@ -14,18 +40,22 @@ class SearchTables:
             row_count,
             bytes
         FROM information_schema.tables
-        WHERE (UPPER(table_name) LIKE UPPER('%{search_term}%')
-           OR UPPER(comment) LIKE UPPER('%{search_term}%'))
+        WHERE (UPPER(table_name) LIKE %s
+           OR UPPER(comment) LIKE %s)
         """
+        # Upper-case the pattern once here rather than in every row's comparison
+        pattern = f"%{search_term.upper()}%"
+        params = [pattern, pattern]
         
         if database_name:
-            query += f" AND table_catalog = '{database_name}'"
+            query += " AND table_catalog = %s"
+            params.append(database_name)
             
         query += " ORDER BY table_catalog, table_schema, table_name"
         
-        conn = self.verify_link()
-        with conn.cursor() as cursor:
-            cursor.execute(query)
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
\ No newline at end of file
+        if account_wide and not database_name:
+            query = _ACCOUNT_TABLES_SQL
+        
+        with self.checkout() as conn, conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return result_table(cursor)
\ No newline at end of file
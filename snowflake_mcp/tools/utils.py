@@ -0,0 +1,120 @@
+import base64
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Target size in bytes for each chunk of newline-delimited rows
+ROW_CHUNK_SIZE = 64 * 1024
+
+# Text payloads of at least this many bytes are gzip-compressed; 0 disables compression
+COMPRESS_THRESHOLD = int(os.getenv("SNOWFLAKE_MCP_COMPRESS_THRESHOLD", "0"))
+COMPRESSED_PREFIX = "[[GZIP-B64]]"
+
+# Types information_schema.columns reports for numeric columns, plus their synonyms
+NUMERIC_TYPES = frozenset({
+    'NUMBER', 'DECIMAL', 'NUMERIC', 'INT', 'INTEGER', 'BIGINT', 'SMALLINT', 'TINYINT', 'BYTEINT',
+    'FLOAT', 'FLOAT4', 'FLOAT8', 'DOUBLE', 'DOUBLE PRECISION', 'REAL'
+})
+
+# Most rows an account-wide ACCOUNT_USAGE search returns
+ACCOUNT_SEARCH_LIMIT = 1000
+
+# Identifiers Snowflake accepts unquoted, and identifiers the caller already quoted
+_PLAIN_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+_QUOTED_IDENTIFIER_RE = re.compile(r'^"(?:[^"]|"")+"$')
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a tool result to indented JSON, stringifying unsupported types."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj, indent=2, default=str)
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one row to a compact JSON line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE, default=str)
+        except TypeError:
+            pass
+    return (json.dumps(obj, default=str) + "\n").encode()
+
+
+def dumps_rows(rows: Iterable[Any], chunk_size: int = ROW_CHUNK_SIZE) -> Iterator[str]:
+    """Serialize rows as newline-delimited JSON, yielding chunks of roughly chunk_size bytes.
+
+    Chunks always end on a row boundary so each one is independently parseable.
+    """
+    buffer = bytearray()
+    for row in rows:
+        buffer += _dumps_line(row)
+        if len(buffer) >= chunk_size:
+            yield buffer.decode()
+            buffer.clear()
+    if buffer:
+        yield buffer.decode()
+
+
+def compress_text(text: str, threshold: int = COMPRESS_THRESHOLD) -> str:
+    """Gzip and base64-encode large text, prefixed with COMPRESSED_PREFIX so clients can detect it."""
+    if not threshold:
+        return text
+    data = text.encode()
+    if len(data) < threshold:
+        return text
+    return COMPRESSED_PREFIX + base64.b64encode(gzip.compress(data, compresslevel=6)).decode()
+
+
+def column_names(cursor: Any) -> List[str]:
+    """Return the column names of the cursor's current result set.
+
+    Names are interned so every row dict and cached result built from them
+    shares one copy of each key.
+    """
+    return [sys.intern(col[0]) for col in cursor.description]
+
+
+def result_table(cursor: Any) -> Dict[str, Any]:
+    """Return the cursor's current result set as its column names plus rows as tuples."""
+    return {"columns": column_names(cursor), "rows": cursor.fetchall()}
+
+
+def quote_identifier(name: str) -> str:
+    """Quote an identifier exactly as given, doubling any embedded double quotes."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def qualify(*parts: Optional[str]) -> str:
+    """
+    Join identifier parts into a dotted object name, skipping empty parts.
+
+    Plain identifiers stay unquoted so Snowflake still resolves them
+    case-insensitively; anything else is quoted so it cannot alter the SQL.
+    """
+    return '.'.join(
+        part if _PLAIN_IDENTIFIER_RE.match(part) or _QUOTED_IDENTIFIER_RE.match(part)
+        else quote_identifier(part)
+        for part in parts if part
+    )
+
+
+def catalog_name(identifier: str) -> str:
+    """Return the name INFORMATION_SCHEMA reports for an identifier as qualify() emits it."""
+    if _PLAIN_IDENTIFIER_RE.match(identifier):
+        return identifier.upper()
+    if _QUOTED_IDENTIFIER_RE.match(identifier):
+        return identifier[1:-1].replace('""', '"')
+    return identifier